@@ -17,6 +17,9 @@ import googlemaps
 import os
 from dotenv import load_dotenv
 
+# Ingest-time wait aggregates (see waitstats.py)
+from waitstats import FORECAST_CSV
+
 load_dotenv()  # Load environment variables from .env file
 
 api_key = os.environ.get("GOOGLE_MAPS_API_KEY")
@@ -68,6 +71,19 @@ else:
 #     wait_col = 'WT_FA_E'
 wait_col = 'WT_FA_E'  # Always use First Assessment wait time for simplicity
 
+# Precomputed expected wait for the current period, maintained by the scraper at
+# ingest time. Falls back to the latest reported value for hospitals with no history.
+expected_cols = {col: f'{col}_EXPECTED' for col in ['WT_FA_E', 'LS_E_HU_NA', 'LS_E_LU_NA', 'LS_E_A']}
+if os.path.exists(FORECAST_CSV):
+    forecast = pd.read_csv(FORECAST_CSV, usecols=['HOSPITAL', *expected_cols.values()])
+    forecast = forecast.drop_duplicates('HOSPITAL')
+    df = df.merge(forecast, on='HOSPITAL', how='left', validate='many_to_one')
+    for col, expected_col in expected_cols.items():
+        df[expected_col] = df[expected_col].fillna(df[col])
+else:
+    for col, expected_col in expected_cols.items():
+        df[expected_col] = df[col]
+
 # Add wait time with travel time buffer
 # Define origin and destination coordinates
 # Calculate total wait time (hospital wait + travel time) for each hospital
@@ -118,7 +134,6 @@ if address_changed or f"{address}_travel_times" not in st.session_state:
     progress_bar = st.progress(0)
     status_text = st.empty()
 
-    total_wait_times = []
     travel_times_cache = {}  # Cache to avoid duplicate API calls
 
     for idx, row in df.iterrows():
@@ -160,10 +175,6 @@ if address_changed or f"{address}_travel_times" not in st.session_state:
                 st.warning(f"Error calculating travel time to {row['HOSPITAL']}: {str(e)}")
                 travel_time_hours = 0
                 travel_times_cache[cache_key] = 0
-        
-        # Calculate total wait time
-        total_wait = row[wait_col] + travel_time_hours
-        total_wait_times.append(total_wait)
 
     # Clear progress indicators
     progress_bar.empty()
@@ -171,7 +182,6 @@ if address_changed or f"{address}_travel_times" not in st.session_state:
     
     # Store results in session state
     st.session_state[f"{address}_travel_times"] = travel_times_cache
-    st.session_state[f"{address}_total_wait_times"] = total_wait_times
     st.session_state.last_address = address
     
     st.success("✅ Travel times calculated successfully!")
@@ -179,10 +189,10 @@ if address_changed or f"{address}_travel_times" not in st.session_state:
 else:
     # Use cached results
     travel_times_cache = st.session_state[f"{address}_travel_times"]
-    total_wait_times = st.session_state[f"{address}_total_wait_times"]
 
-df['wait_time'] = total_wait_times
 df['travel_time'] = [travel_times_cache.get(f"{address}|{row['ADDRESS']}", 0) for _, row in df.iterrows()]
+# Total time = expected wait once we get there + travel
+df['wait_time'] = df[f'{wait_col}_EXPECTED'] + df['travel_time']
 
 # Display some statistics for debugging
 st.write(f"📊 Travel times for {len(df)} hospitals from your location:")
@@ -332,18 +342,25 @@ if clicked_data and clicked_data.selection and clicked_data.selection.points:
                 
                 # First Assessment - Large display on its own row
                 st.markdown("#### 🏥 First Assessment")
-                col1, col2 = st.columns(2)
+                expected_wait = selected_hospital['WT_FA_E_EXPECTED']
+                col1, col2, col3 = st.columns(3)
                 with col1:
                     st.metric(
-                        "Wait Time", 
+                        "Latest Reported Wait",
                         f"{selected_hospital['WT_FA_E']:.2f} hrs",
-                        help="Time to first assessment at the hospital"
+                        help=f"Time to first assessment as published for {selected_hospital['DATE'].title()}"
                     )
                 with col2:
+                    st.metric(
+                        "Expected Wait at Arrival",
+                        f"{expected_wait:.2f} hrs",
+                        help="Forecast for the current month from the recent trend (used for ranking)"
+                    )
+                with col3:
                     st.metric(
                         "Total Time (Wait + Travel)", 
-                        f"{selected_hospital['WT_FA_E'] + travel_time_hours:.2f} hrs",
-                        help="Including travel time to the hospital"
+                        f"{expected_wait + travel_time_hours:.2f} hrs",
+                        help="Expected wait at arrival plus travel time to the hospital"
                     )
                 
                 st.markdown("---")  # Separator line
@@ -354,18 +371,21 @@ if clicked_data and clicked_data.selection and clicked_data.selection.points:
                 
                 with col1:
                     st.markdown("**High Urgency (Not Admitted)**")
-                    st.write(f"Wait: {selected_hospital['LS_E_HU_NA']:.2f} hrs")
-                    st.write(f"Total: {selected_hospital['LS_E_HU_NA'] + travel_time_hours:.2f} hrs")
+                    st.write(f"Latest reported: {selected_hospital['LS_E_HU_NA']:.2f} hrs")
+                    st.write(f"Expected: {selected_hospital['LS_E_HU_NA_EXPECTED']:.2f} hrs")
+                    st.write(f"Total: {selected_hospital['LS_E_HU_NA_EXPECTED'] + travel_time_hours:.2f} hrs")
                     
                 with col2:
                     st.markdown("**Low Urgency (Not Admitted)**")
-                    st.write(f"Wait: {selected_hospital['LS_E_LU_NA']:.2f} hrs")
-                    st.write(f"Total: {selected_hospital['LS_E_LU_NA'] + travel_time_hours:.2f} hrs")
+                    st.write(f"Latest reported: {selected_hospital['LS_E_LU_NA']:.2f} hrs")
+                    st.write(f"Expected: {selected_hospital['LS_E_LU_NA_EXPECTED']:.2f} hrs")
+                    st.write(f"Total: {selected_hospital['LS_E_LU_NA_EXPECTED'] + travel_time_hours:.2f} hrs")
                     
                 with col3:
                     st.markdown("**Admitted Patients**")
-                    st.write(f"Wait: {selected_hospital['LS_E_A']:.2f} hrs")
-                    st.write(f"Total: {selected_hospital['LS_E_A'] + travel_time_hours:.2f} hrs")
+                    st.write(f"Latest reported: {selected_hospital['LS_E_A']:.2f} hrs")
+                    st.write(f"Expected: {selected_hospital['LS_E_A_EXPECTED']:.2f} hrs")
+                    st.write(f"Total: {selected_hospital['LS_E_A_EXPECTED'] + travel_time_hours:.2f} hrs")
                 
                 # Show if this is a recommended hospital
                 if selected_hospital['color'] == 'green':
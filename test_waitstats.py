@@ -0,0 +1,190 @@
+import csv
+
+import pytest
+
+from waitstats import (
+    MAX_HORIZON,
+    WINDOW,
+    MetricStats,
+    WaitStats,
+    ingest_csv,
+    parse_period,
+)
+
+MONTHS = ["JANUARY", "FEBRUARY", "MARCH", "APRIL", "MAY", "JUNE", "JULY",
+          "AUGUST", "SEPTEMBER", "OCTOBER", "NOVEMBER", "DECEMBER"]
+
+
+def period_text(i):
+    """Reporting period text for the i-th month starting at JANUARY 2024."""
+    return f"{MONTHS[i % 12]} {2024 + i // 12}"
+
+
+def test_parse_period():
+    assert parse_period("SEPTEMBER 2025") == 2025 * 12 + 8
+    assert parse_period("OCTOBER 2025") - parse_period("SEPTEMBER 2025") == 1
+    assert parse_period("JANUARY 2026") - parse_period("DECEMBER 2025") == 1
+    assert parse_period("") is None
+    assert parse_period("not a date") is None
+
+
+def test_window_eviction_keeps_running_sum():
+    stats = MetricStats()
+    for i in range(WINDOW + 5):
+        stats.update(float(i), i)
+
+    assert len(stats.values) == WINDOW
+    assert stats.total == pytest.approx(sum(stats.values))
+    assert stats.mean == pytest.approx(sum(range(5, WINDOW + 5)) / WINDOW)
+
+
+def test_same_period_is_ingested_once():
+    agg = WaitStats()
+    for _ in range(3):
+        agg.update("H", {"WT_FA_E": "0.7"}, "SEPTEMBER 2025")
+    agg.update("H", {"WT_FA_E": "0.9"}, "AUGUST 2025")  # older period
+
+    stats = agg.hospitals["H"]["WT_FA_E"]
+    assert list(stats.values) == [0.7]
+    assert stats.level == 0.7
+
+
+def test_corrected_value_replaces_latest_period():
+    corrected, direct = WaitStats(window=2), WaitStats(window=2)
+    for i, value in enumerate(["0.7", "1.0", "1.5"]):
+        corrected.update("H", {"WT_FA_E": value}, period_text(i))
+    # HQO republishes the latest month with a different value
+    corrected.update("H", {"WT_FA_E": "2.0"}, period_text(2))
+
+    for i, value in enumerate(["0.7", "1.0", "2.0"]):
+        direct.update("H", {"WT_FA_E": value}, period_text(i))
+
+    stats = corrected.hospitals["H"]["WT_FA_E"]
+    assert list(stats.values) == [1.0, 2.0]
+    assert stats.total == pytest.approx(3.0)
+    assert stats.to_dict() == pytest.approx(direct.hospitals["H"]["WT_FA_E"].to_dict())
+
+
+def test_data_refresh_does_not_explode_trend():
+    # Two scrapes of the same month then a refresh to the next month
+    agg = WaitStats()
+    agg.update("H", {"WT_FA_E": "0.7"}, "AUGUST 2025")
+    agg.update("H", {"WT_FA_E": "0.7"}, "AUGUST 2025")
+    agg.update("H", {"WT_FA_E": "1.2"}, "SEPTEMBER 2025")
+
+    stats = agg.hospitals["H"]["WT_FA_E"]
+    assert stats.level == pytest.approx(0.95)
+    assert stats.trend == pytest.approx(0.075)
+    assert stats.forecast(parse_period("OCTOBER 2025")) == pytest.approx(1.025)
+
+
+def test_forecast_projects_to_current_period():
+    stats = MetricStats()
+    for i, value in enumerate([0.7, 1.0, 2.0]):
+        stats.update(value, i)
+
+    assert stats.level == pytest.approx(1.4475)
+    assert stats.trend == pytest.approx(0.21075)
+    assert stats.forecast(2) == pytest.approx(1.4475)
+    assert stats.forecast(3) == pytest.approx(1.65825)
+    # Stale data is only extrapolated MAX_HORIZON months
+    capped = 1.4475 + 0.21075 * MAX_HORIZON
+    assert stats.forecast(2 + MAX_HORIZON) == pytest.approx(capped)
+    assert stats.forecast(2 + MAX_HORIZON + 6) == pytest.approx(capped)
+
+
+def test_trend_follows_evenly_spaced_inputs():
+    rising, falling = MetricStats(), MetricStats()
+    for i in range(24):
+        rising.update(1.0 + 0.1 * i, i)
+        falling.update(5.0 - 0.2 * i, i)
+
+    # Holt converges to the true per-period slope on a linear series
+    assert rising.trend == pytest.approx(0.1, abs=1e-3)
+    assert falling.trend == pytest.approx(-0.2, abs=1e-3)
+    assert rising.level == pytest.approx(1.0 + 0.1 * 23, abs=1e-2)
+
+
+def test_forecast_is_clamped_at_zero():
+    stats = MetricStats()
+    for i, value in enumerate([4.0, 2.0, 0.1]):
+        stats.update(value, i)
+
+    assert stats.trend < 0
+    assert stats.forecast(2 + MAX_HORIZON) == 0
+
+
+def test_save_load_round_trip(tmp_path):
+    path = tmp_path / "stats.json"
+    agg = WaitStats(window=3)
+    for i in range(5):
+        agg.update("H", {"WT_FA_E": str(1.0 + i), "LS_E_A": ""}, period_text(i))
+    agg.save(path)
+
+    # Saved window wins over the one passed in
+    loaded = WaitStats.load(path, window=WINDOW)
+    assert loaded.window == 3
+
+    before = agg.hospitals["H"]["WT_FA_E"]
+    after = loaded.hospitals["H"]["WT_FA_E"]
+    assert after.to_dict() == before.to_dict()
+    assert after.values.maxlen == 3
+    assert after.total == pytest.approx(before.total)
+    assert "LS_E_A" not in loaded.hospitals["H"]
+
+    # Reloaded state still skips periods already folded in
+    loaded.update("H", {"WT_FA_E": "5.0"}, period_text(4))
+    loaded.update("H", {"WT_FA_E": "99"}, period_text(3))
+    assert after.to_dict() == before.to_dict()
+
+    # ...and can still redo the latest period on a correction
+    loaded.update("H", {"WT_FA_E": "6.0"}, period_text(4))
+    agg.update("H", {"WT_FA_E": "6.0"}, period_text(4))
+    assert after.to_dict() == pytest.approx(before.to_dict())
+
+
+def test_export_csv_writes_expected_for_period(tmp_path):
+    path = tmp_path / "forecast.csv"
+    agg = WaitStats()
+    for i, value in enumerate(["0.7", "1.0", "2.0"]):
+        agg.update("H", {"WT_FA_E": value}, period_text(i))
+    agg.export_csv(path, period=parse_period(period_text(3)))
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    # WT_FA_E_EXPECTED is the column app.py ranks on
+    assert float(rows[0]["WT_FA_E_EXPECTED"]) == pytest.approx(1.65825)
+    assert float(rows[0]["WT_FA_E_LEVEL"]) == pytest.approx(1.4475)
+
+
+def test_export_csv_blanks_missing_metrics(tmp_path):
+    path = tmp_path / "forecast.csv"
+    agg = WaitStats()
+    agg.update("H", {"WT_FA_E": "0.7", "LS_E_A": ""}, "SEPTEMBER 2025")
+    agg.export_csv(path, period=parse_period("SEPTEMBER 2025"))
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    assert len(rows) == 1
+    assert rows[0]["HOSPITAL"] == "H"
+    assert float(rows[0]["WT_FA_E_LEVEL"]) == 0.7
+    assert float(rows[0]["WT_FA_E_TREND"]) == 0.0
+    assert float(rows[0]["WT_FA_E_EXPECTED"]) == 0.7
+    assert rows[0]["LS_E_A_MEAN"] == ""
+    assert rows[0]["LS_E_A_EXPECTED"] == ""
+
+
+def test_ingest_csv_is_idempotent(tmp_path):
+    scraped = tmp_path / "scraped.csv"
+    with open(scraped, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["HOSPITAL", "DATE", "WT_FA_E"])
+        writer.writerow(["H", "SEPTEMBER 2025", "0.7"])
+
+    state, forecast = tmp_path / "stats.json", tmp_path / "forecast.csv"
+    ingest_csv(scraped, state, forecast)
+    agg = ingest_csv(scraped, state, forecast)
+
+    assert list(agg.hospitals["H"]["WT_FA_E"].values) == [0.7]
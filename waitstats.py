@@ -0,0 +1,258 @@
+import csv
+import json
+import os
+from collections import deque
+from datetime import datetime
+
+# Metric columns written by webscraper.py (same order as the CSV header)
+METRICS = [
+    "WT_FA_E",         # Wait Time to First Assessment in ED
+    "LS_E_LU_NA",      # Length of Stay ED Low-Urgency, Not Admitted
+    "PCNT_F_4H_TT",    # % finished within 4h target time
+    "LS_E_HU_NA",      # Length of Stay ED High-Urgency, Not Admitted
+    "PCNT_F_8H_TT",    # % finished within 8h target time
+    "LS_E_A",          # Length of Stay ED - All (Admitted)
+    "PCNT_AFE_8H_TT"   # % admitted from ED within 8h target time
+]
+
+STATE_JSON = "hqontario_ed_stats.json"
+FORECAST_CSV = "hqontario_ed_forecast.csv"
+
+WINDOW = 12         # number of reporting periods kept for the rolling mean
+EWMA_ALPHA = 0.3    # smoothing for the exponentially weighted average
+HOLT_ALPHA = 0.5    # level smoothing for the trend forecast
+HOLT_BETA = 0.3     # trend smoothing for the trend forecast
+MAX_HORIZON = 3     # most months the trend is extrapolated past the latest data
+
+
+def parse_value(raw):
+    """Return a float for a scraped metric, or None if blank/unparseable."""
+    try:
+        return float(str(raw).strip().replace("%", ""))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_period(raw):
+    """Turn an HQO reporting period like "SEPTEMBER 2025" into a month index.
+
+    Returns year * 12 + (month - 1) so consecutive months differ by 1,
+    or None if the text can't be parsed.
+    """
+    try:
+        date = datetime.strptime(str(raw).strip().title(), "%B %Y")
+    except ValueError:
+        return None
+    return date.year * 12 + date.month - 1
+
+
+def current_period():
+    """Month index (as in parse_period) for today's date."""
+    today = datetime.now()
+    return today.year * 12 + today.month - 1
+
+
+class MetricStats:
+    """Running aggregates for one hospital/metric pair.
+
+    Every update is O(1): the rolling window keeps a running sum, and the
+    EWMA / Holt level + trend only depend on their previous values.
+    Observations are keyed on the reporting period, so each month is
+    folded in once no matter how often the scraper runs; a corrected value
+    for the latest month replaces the one ingested before.
+    """
+
+    def __init__(self, window=WINDOW):
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.ewma = None
+        self.level = None
+        self.trend = 0.0    # change in metric per reporting period
+        self.last_period = None
+        # Smoothing state before the latest period, to redo it on a correction
+        self.prev = (None, None, 0.0, None)
+
+    def update(self, value, period):
+        """Fold in the value for a period; returns False if nothing changed."""
+        if self.last_period is not None and period < self.last_period:
+            print(f"  Warning: skipping value for period {period}, "
+                  f"already past {self.last_period}.")
+            return False
+
+        if period == self.last_period:
+            if value == self.values[-1]:
+                return False
+            # HQO corrected the latest month: swap it in and redo its step
+            self.total += value - self.values[-1]
+            self.values[-1] = value
+            self.ewma, self.level, self.trend, self.last_period = self.prev
+            self._smooth(value, period)
+            return True
+
+        # Rolling mean: drop the oldest value from the running sum if full
+        if len(self.values) == self.values.maxlen:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+
+        self.prev = (self.ewma, self.level, self.trend, self.last_period)
+        self._smooth(value, period)
+        return True
+
+    def _smooth(self, value, period):
+        if self.ewma is None:
+            self.ewma = value
+            self.level = value
+        else:
+            self.ewma = EWMA_ALPHA * value + (1 - EWMA_ALPHA) * self.ewma
+
+            # Holt's linear trend; dt is a whole number of months (>= 1),
+            # so a gap in the data can't blow the slope up
+            dt = period - self.last_period
+            prev_level = self.level
+            self.level = HOLT_ALPHA * value + (1 - HOLT_ALPHA) * (prev_level + self.trend * dt)
+            self.trend = HOLT_BETA * (self.level - prev_level) / dt + (1 - HOLT_BETA) * self.trend
+
+        self.last_period = period
+
+    @property
+    def mean(self):
+        return self.total / len(self.values) if self.values else None
+
+    def forecast(self, period):
+        """Expected value for `period`, projected from the latest ingested month.
+
+        Travel time is a tiny fraction of a month, so the arrival-time forecast
+        is just the forecast for the current reporting period. Stale data is
+        only extrapolated MAX_HORIZON months out.
+        """
+        months = min(max(period - self.last_period, 0), MAX_HORIZON)
+        # Waits and percentages can't go negative, however steep the trend
+        return max(self.level + self.trend * months, 0)
+
+    def to_dict(self):
+        return {
+            "values": list(self.values),
+            "ewma": self.ewma,
+            "level": self.level,
+            "trend": self.trend,
+            "last_period": self.last_period,
+            "prev": list(self.prev),
+        }
+
+    @classmethod
+    def from_dict(cls, data, window=WINDOW):
+        stats = cls(window)
+        stats.values.extend(data["values"])
+        stats.total = sum(stats.values)
+        stats.ewma = data["ewma"]
+        stats.level = data["level"]
+        stats.trend = data["trend"]
+        stats.last_period = data["last_period"]
+        stats.prev = tuple(data["prev"])
+        return stats
+
+
+class WaitStats:
+    """Per-hospital aggregates for every HQO metric, fed one scraped row at a time."""
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self.hospitals = {}
+
+    def update(self, hospital, row, period):
+        """Fold one scraped record ({metric: raw value}) for a reporting period.
+
+        `period` is the scraped DATE text (e.g. "SEPTEMBER 2025"). Rows with an
+        unparseable period, or for a period already ingested, are skipped.
+        """
+        period = parse_period(period)
+        if period is None:
+            return
+
+        metrics = self.hospitals.setdefault(hospital, {})
+        for col in METRICS:
+            value = parse_value(row.get(col))
+            if value is None:
+                continue
+            if col not in metrics:
+                metrics[col] = MetricStats(self.window)
+            metrics[col].update(value, period)
+
+    def save(self, path=STATE_JSON):
+        state = {
+            "window": self.window,
+            "hospitals": {
+                hospital: {col: stats.to_dict() for col, stats in metrics.items()}
+                for hospital, metrics in self.hospitals.items()
+            },
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+    @classmethod
+    def load(cls, path=STATE_JSON, window=WINDOW):
+        """Load saved aggregates, or start empty if no state file exists yet.
+
+        `window` only applies to a fresh start; saved state keeps the window
+        it was built with so histories of different lengths don't get mixed.
+        """
+        if not os.path.exists(path):
+            return cls(window)
+
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+
+        window = state["window"]
+        agg = cls(window)
+        for hospital, metrics in state["hospitals"].items():
+            agg.hospitals[hospital] = {
+                col: MetricStats.from_dict(data, window) for col, data in metrics.items()
+            }
+        return agg
+
+    def export_csv(self, path=FORECAST_CSV, period=None):
+        """Write one row per hospital with _MEAN, _EWMA, _LEVEL, _TREND and
+        _EXPECTED per metric, where _EXPECTED is the forecast for `period`
+        (defaults to the current month).
+
+        This is the precomputed table app.py reads at request time, so the
+        cost of ranking does not grow with the amount of history kept.
+        """
+        if period is None:
+            period = current_period()
+
+        header = ["HOSPITAL"]
+        for col in METRICS:
+            header += [f"{col}_MEAN", f"{col}_EWMA", f"{col}_LEVEL", f"{col}_TREND", f"{col}_EXPECTED"]
+
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for hospital, metrics in self.hospitals.items():
+                out = [hospital]
+                for col in METRICS:
+                    stats = metrics.get(col)
+                    if stats is None:
+                        out += ["", "", "", "", ""]
+                    else:
+                        out += [stats.mean, stats.ewma, stats.level, stats.trend, stats.forecast(period)]
+                writer.writerow(out)
+
+
+def ingest_csv(input_csv, state_path=STATE_JSON, forecast_csv=FORECAST_CSV):
+    """Fold a scraped CSV (webscraper.py output) into the saved aggregates."""
+    agg = WaitStats.load(state_path)
+
+    with open(input_csv, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            agg.update(row["HOSPITAL"], row, row["DATE"])
+
+    agg.save(state_path)
+    agg.export_csv(forecast_csv)
+    return agg
+
+
+if __name__ == "__main__":
+    ingest_csv("hqontario_ed_all_metrics.csv")
+    print("Aggregates updated.")
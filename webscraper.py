@@ -7,6 +7,8 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from waitstats import WaitStats, STATE_JSON, FORECAST_CSV
+
 URL = "https://www.hqontario.ca/system-performance/time-spent-in-emergency-departments"
 
 
@@ -18,10 +20,14 @@ def get_driver():
     return driver
 
 
-def scrape_hqontario(output_csv="hqontario_ed_metrics.csv"):
+def scrape_hqontario(output_csv="hqontario_ed_metrics.csv",
+                     state_json=STATE_JSON, forecast_csv=FORECAST_CSV):
     driver = get_driver()
     wait = WebDriverWait(driver, 15)
 
+    # Rolling aggregates are updated row by row as we scrape
+    stats = WaitStats.load(state_json)
+
     try:
         driver.get(URL)
 
@@ -181,6 +187,20 @@ def scrape_hqontario(output_csv="hqontario_ed_metrics.csv"):
                     pcnt_afe_8h_tt
                 ])
 
+                stats.update(hospitalname, {
+                    "WT_FA_E": wt_fa_e,
+                    "LS_E_LU_NA": ls_e_lu_na,
+                    "PCNT_F_4H_TT": pcnt_f_4h_tt,
+                    "LS_E_HU_NA": ls_e_hu_na,
+                    "PCNT_F_8H_TT": pcnt_f_8h_tt,
+                    "LS_E_A": ls_e_a,
+                    "PCNT_AFE_8H_TT": pcnt_afe_8h_tt,
+                }, period_text)
+
+        # Persist aggregates and the precomputed table app.py reads
+        stats.save(state_json)
+        stats.export_csv(forecast_csv)
+
     finally:
         driver.quit()
 